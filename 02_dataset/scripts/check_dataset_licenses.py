@@ -13,20 +13,33 @@ from __future__ import annotations
 
 import argparse
 import json
-import re
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List
 
 
+# Keyed on mtime so an edited file is re-read on the next audit
+@lru_cache(maxsize=8)
+def _read_cached(path: str, mtime_ns: int) -> str:
+    return Path(path).read_text(encoding="utf-8")
+
+
+def read_text_cached(path: Path) -> str:
+    return _read_cached(str(path), path.stat().st_mtime_ns)
+
+
 def load_registry(registry_path: Path) -> str:
-    return registry_path.read_text(encoding="utf-8")
+    return read_text_cached(registry_path)
 
 
 def validate_license_entries(
     manifest_sources: List[Dict], registry_text: str
 ) -> List[Dict]:
     results: List[Dict] = []
+    # Lowercase the registry once; a case-insensitive substring test then
+    # replaces a regex search per source
+    registry_lower = registry_text.lower()
     for source in manifest_sources:
         license_name = source.get("license", "").strip()
         source_name = source.get("name", "UNKNOWN")
@@ -35,8 +48,7 @@ def validate_license_entries(
         if not license_name:
             issues.append("License field missing in manifest.")
         else:
-            license_pattern = re.escape(license_name)
-            if not re.search(license_pattern, registry_text, re.IGNORECASE):
+            if license_name.lower() not in registry_lower:
                 issues.append(
                     f"License '{license_name}' not documented in registry."
                 )
@@ -59,7 +71,17 @@ def validate_license_entries(
 
 
 def run_audit(manifest_path: Path, registry_path: Path) -> Dict:
-    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    manifest = json.loads(read_text_cached(manifest_path))
+    if not registry_path.is_file():
+        # Every source would fail the same way; report the root cause once
+        return {
+            "audited_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "manifest_version": manifest.get("version"),
+            "registry": str(registry_path),
+            "status": "error",
+            "issue": "registry missing",
+            "results": [],
+        }
     registry_text = load_registry(registry_path)
     manifest_sources = manifest.get("sources", [])
     results = validate_license_entries(manifest_sources, registry_text)
@@ -73,7 +95,9 @@ def run_audit(manifest_path: Path, registry_path: Path) -> Dict:
 
 def write_report(report: Dict, report_path: Path) -> None:
     report_path.parent.mkdir(parents=True, exist_ok=True)
-    report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    # Stream into the file rather than building the whole document first
+    with report_path.open("w", encoding="utf-8", buffering=1 << 16) as fh:
+        json.dump(report, fh, indent=2)
 
 
 def parse_args() -> argparse.Namespace:
@@ -8,6 +8,8 @@ const Module = require('./edge-impulse-standalone');
 const app = express();
 app.use(cors());
 app.use(express.json());
+// Raw little-endian float32 features (Content-Type: application/octet-stream)
+app.use(express.raw({ type: 'application/octet-stream', limit: '1mb' }));
 
 // Classifier module
 let classifierInitialized = false;
@@ -49,11 +51,12 @@ class EdgeImpulseClassifier {
     }
 
     _arrayToHeap(data) {
-        let typedArray = new Float32Array(data);
+        // Float32Array input (binary requests) is copied straight into the heap
+        let typedArray = data instanceof Float32Array ? data : new Float32Array(data);
         let numBytes = typedArray.length * typedArray.BYTES_PER_ELEMENT;
         let ptr = Module._malloc(numBytes);
         let heapBytes = new Uint8Array(Module.HEAPU8.buffer, ptr, numBytes);
-        heapBytes.set(new Uint8Array(typedArray.buffer));
+        heapBytes.set(new Uint8Array(typedArray.buffer, typedArray.byteOffset, numBytes));
         return { ptr: ptr, buffer: heapBytes };
     }
 
@@ -86,40 +89,106 @@ classifier.init().then(() => {
     console.error('❌ Failed to initialize classifier:', err);
 });
 
-// POST /api/predict - accepts feature array
+// Summarize one classifier result in the response format used by the clients
+function buildPrediction(result) {
+    const fireResult = result.results.find(r => r.label === 'fire');
+    const fireConfidence = fireResult ? fireResult.value : 0;
+
+    return {
+        prediction: fireConfidence > 0.5 ? 1 : 0,
+        prediction_text: fireConfidence > 0.5 ? 'FIRE DETECTED 🔥' : 'NO FIRE ✅',
+        confidence: fireConfidence,
+        confidence_percent: (fireConfidence * 100).toFixed(1),
+        all_results: result.results,
+        model_type: 'Edge Impulse (98.92% accuracy)'
+    };
+}
+
+function isFeatureVector(features) {
+    return Array.isArray(features) && features.length > 0;
+}
+
+// Binary request body: float32 features, optionally X-Feature-Rows rows of
+// equal width for a batch. Parsed directly, no JSON number parsing.
+function predictFromBuffer(req, res) {
+    const body = req.body;
+    if (body.length === 0 || body.length % Float32Array.BYTES_PER_ELEMENT !== 0) {
+        return res.status(400).json({
+            status: 'error',
+            message: 'Invalid features. Expected float32 bytes.'
+        });
+    }
+
+    // View the body in place when it is 4-byte aligned; small bodies can sit
+    // at an odd offset in Node's Buffer pool and have to be copied out
+    const floats = body.byteOffset % Float32Array.BYTES_PER_ELEMENT === 0
+        ? new Float32Array(body.buffer, body.byteOffset, body.length / Float32Array.BYTES_PER_ELEMENT)
+        : new Float32Array(body.buffer.slice(body.byteOffset, body.byteOffset + body.length));
+    const rows = parseInt(req.get('X-Feature-Rows') || '0', 10);
+
+    if (rows > 0) {
+        if (floats.length % rows !== 0) {
+            return res.status(400).json({
+                status: 'error',
+                message: 'Invalid features. Byte length does not match X-Feature-Rows.'
+            });
+        }
+
+        const width = floats.length / rows;
+        const predictions = [];
+        for (let i = 0; i < rows; i++) {
+            predictions.push(buildPrediction(classifier.classify(floats.subarray(i * width, (i + 1) * width))));
+        }
+        return res.json({ status: 'success', predictions: predictions });
+    }
+
+    return res.json({
+        status: 'success',
+        ...buildPrediction(classifier.classify(floats))
+    });
+}
+
+// POST /api/predict - accepts a feature array, or an array of feature arrays
+// to classify a batch in one round trip, as JSON or as raw float32 bytes
 app.post('/api/predict', (req, res) => {
     try {
+        if (Buffer.isBuffer(req.body)) {
+            return predictFromBuffer(req, res);
+        }
+
         const features = req.body.features;
         
-        if (!features || !Array.isArray(features) || features.length === 0) {
+        if (!isFeatureVector(features)) {
             return res.status(400).json({ 
                 status: 'error',
                 message: 'Invalid features. Expected array of numbers.' 
             });
         }
 
+        // Batch: {"features": [[...], [...]]} -> {"predictions": [...]}
+        if (Array.isArray(features[0])) {
+            if (!features.every(isFeatureVector)) {
+                return res.status(400).json({
+                    status: 'error',
+                    message: 'Invalid features. Expected array of number arrays.'
+                });
+            }
+
+            const predictions = features.map(row =>
+                buildPrediction(classifier.classify(row.map(f => parseFloat(f))))
+            );
+            return res.json({ status: 'success', predictions: predictions });
+        }
+
         // Convert to numbers
         const numFeatures = features.map(f => parseFloat(f));
 
         // Classify
         const result = classifier.classify(numFeatures);
         
-        // Find fire and non-fire predictions
-        const fireResult = result.results.find(r => r.label === 'fire');
-        const nominalResult = result.results.find(r => r.label === 'nominal');
-        const rainResult = result.results.find(r => r.label === 'rain');
-        const windResult = result.results.find(r => r.label === 'wind');
-
-        const fireConfidence = fireResult ? fireResult.value : 0;
-        
         res.json({
             status: 'success',
-            prediction: fireConfidence > 0.5 ? 1 : 0,
-            prediction_text: fireConfidence > 0.5 ? 'FIRE DETECTED 🔥' : 'NO FIRE ✅',
-            confidence: fireConfidence,
-            confidence_percent: (fireConfidence * 100).toFixed(1),
-            all_results: result.results,
-            model_type: 'Edge Impulse (98.92% accuracy)'
+            ...buildPrediction(result)
         });
     } catch (err) {
         console.error('Prediction error:', err);
@@ -153,13 +222,13 @@ app.get('/api/model-info', (req, res) => {
 });
 
 const PORT = 5001;
-app.listen(PORT, () => {
+const server = app.listen(PORT, () => {
     console.log('\n' + '='.repeat(80));
     console.log('🔥 Edge Impulse Model Server');
     console.log('='.repeat(80));
     console.log(`\n✅ Server running on http://localhost:${PORT}`);
     console.log('\nEndpoints:');
-    console.log('  POST /api/predict       - Classify features (accepts JSON with "features" array)');
+    console.log('  POST /api/predict       - Classify features (JSON "features" array(s) or raw float32 bytes)');
     console.log('  GET  /api/health        - Check if model is ready');
     console.log('  GET  /api/model-info    - Get model metrics');
     console.log('\nModel Info:');
@@ -169,3 +238,8 @@ app.listen(PORT, () => {
     console.log('  Model Size: 1.1MB');
     console.log('\n' + '='.repeat(80) + '\n');
 });
+
+// Keep idle client connections open well past Node's 5 s default so the
+// Python clients' pooled keep-alive sockets survive between clicks
+server.keepAliveTimeout = 65000;
+server.headersTimeout = 66000;
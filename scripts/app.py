@@ -4,18 +4,45 @@ Allows you to upload and test audio files without hardware
 """
 
 from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import os
+import io
 import json
+import random
+import hashlib
+import tempfile
+import threading
 import numpy as np
+import orjson
 import librosa
+import soundfile as sf
+import scipy.fft
+from numba import njit
 from pathlib import Path
 from datetime import datetime
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from joblib import Memory
 import traceback
 import requests
+from requests.adapters import HTTPAdapter
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (also serializes NumPy values)."""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj, default=self.default, option=orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)  # Enable CORS for all routes
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max file size
@@ -29,6 +56,19 @@ CONFIG = {
     'n_mfcc': 13,  # MFCC coefficients
 }
 
+# STFT settings (librosa defaults, as used when the model was trained)
+N_FFT = 2048
+HOP_LENGTH = 512
+
+# Mel filterbanks and DCT basis, built once instead of inside every
+# librosa.feature.mfcc / melspectrogram call. The energy features only use
+# the first 8 bands of a 64-band filterbank, so only those rows are kept.
+MFCC_MEL_BASIS = librosa.filters.mel(sr=CONFIG['sr'], n_fft=N_FFT, n_mels=128)
+ENERGY_MEL_BASIS = librosa.filters.mel(sr=CONFIG['sr'], n_fft=N_FFT, n_mels=64)[:8]
+DCT_BASIS = scipy.fft.dct(
+    np.eye(MFCC_MEL_BASIS.shape[0], dtype=np.float32), type=2, norm='ortho', axis=0
+)[:CONFIG['n_mfcc']]
+
 # Load model metrics
 MODEL_METRICS_PATH = Path('04_models/baseline/baseline_performance.json')
 try:
@@ -37,31 +77,156 @@ try:
 except:
     MODEL_METRICS = None
 
-# Store test results
-test_results = []
+# Store the most recent test results (bounded so long-running servers
+# don't grow without limit)
+MAX_STORED_RESULTS = 500
+test_results = deque(maxlen=MAX_STORED_RESULTS)
+
+# LRU cache of extracted EI features, keyed by audio content hash (uploads)
+# or by (path, mtime) (EI batch tests), so re-submitted files skip librosa
+FEATURE_CACHE_SIZE = 512
+feature_cache = OrderedDict()
+feature_cache_lock = threading.Lock()
+
+# On-disk cache of batch-test features keyed by (path, mtime), shared by
+# all workers and kept across restarts, so re-running a labeled directory
+# skips decoding and librosa entirely. Lives under the repo root whatever
+# the working directory.
+FEATURE_MEMORY = Memory(Path(__file__).resolve().parent.parent / '.cache' / 'features', verbose=0)
+
+# Part of every stored_mfcc_features key: joblib only notices edits to the
+# cached function itself, so bump FEATURE_VERSION when load_audio or the
+# MFCC computation changes; the DSP parameters are included directly.
+FEATURE_VERSION = 1
+FEATURE_PARAMS = (
+    FEATURE_VERSION, CONFIG['sr'], CONFIG['n_mfcc'], N_FFT, HOP_LENGTH, MFCC_MEL_BASIS.shape[0]
+)
+
+# Worker threads for decoding/extracting files in batch tests
+BATCH_WORKERS = 8
 
 # Edge Impulse Model Server URL
 EI_MODEL_SERVER = 'http://localhost:5001'
 
-def extract_features_for_ei_model(audio_path):
-    """Extract features exactly as Edge Impulse expects them."""
+# Shared keep-alive session so predictions reuse pooled connections
+# instead of opening a new TCP connection per request
+EI_SESSION = requests.Session()
+EI_SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+# Optional in-process Edge Impulse model (ONNX export from Edge Impulse).
+# When available it replaces the HTTP hop to the Node.js server entirely;
+# otherwise predictions go through EI_MODEL_SERVER as before.
+EI_ONNX_PATH = Path('04_models/model.onnx')
+# Edge Impulse's evaluation export, which lists the model's class names in
+# output order
+EI_METRICS_PATH = Path('04_models/baseline/ei-wildgaurd-edge-classifier-model-evaluation-metrics-json-file-model.42.json')
+try:
+    import onnxruntime as ort
+    EI_ONNX_SESSION = (
+        ort.InferenceSession(str(EI_ONNX_PATH), providers=['CPUExecutionProvider'])
+        if EI_ONNX_PATH.exists() else None
+    )
+except ImportError:
+    EI_ONNX_SESSION = None
+except Exception as e:
+    # Corrupt or incompatible export: keep serving through the model server
+    print(f"Could not load {EI_ONNX_PATH}, using model server: {e}")
+    EI_ONNX_SESSION = None
+EI_ONNX_INPUT = EI_ONNX_SESSION.get_inputs()[0].name if EI_ONNX_SESSION else None
+
+
+def load_ei_labels(session):
+    """
+    Class labels of the Edge Impulse model in output order: the ONNX
+    'labels' metadata if present, else the class names from the Edge
+    Impulse evaluation export. None if neither is available.
+    """
+    metadata = session.get_modelmeta().custom_metadata_map
+    if 'labels' in metadata:
+        try:
+            labels = json.loads(metadata['labels'])
+        except ValueError:
+            labels = metadata['labels'].split(',')
+        return tuple(str(label).strip() for label in labels)
+    
+    try:
+        with open(EI_METRICS_PATH, encoding='utf-8') as f:
+            validation = json.load(f)['validation']
+        class_names = next(iter(validation.values()))['class_names']
+    except (OSError, ValueError, KeyError, StopIteration):
+        return None
+    return tuple(name.strip() for name in class_names)
+
+
+EI_LABELS = load_ei_labels(EI_ONNX_SESSION) if EI_ONNX_SESSION else None
+
+def power_spectrogram(y):
+    """Power spectrogram |STFT|^2 with the training STFT settings."""
+    return np.abs(librosa.stft(y, n_fft=N_FFT, hop_length=HOP_LENGTH)) ** 2
+
+
+def mfcc_from_power(S):
+    """MFCC matrix from a power spectrogram (same output as librosa.feature.mfcc)."""
+    log_mel = librosa.power_to_db(MFCC_MEL_BASIS @ S)
+    return DCT_BASIS @ log_mel
+
+
+def load_audio(audio):
+    """
+    Decode audio to mono float32 at CONFIG['sr'].
+    
+    Reads with libsndfile directly (no audioread fallback or dtype round
+    trips) and only resamples when the file isn't already at the target
+    rate, using the same soxr_hq resampler as librosa.load. Formats
+    libsndfile can't decode still go through librosa.load; in-memory
+    uploads are spilled to a temporary file first, since librosa only
+    falls back to audioread (ffmpeg) for paths.
+    """
+    try:
+        y, sr = sf.read(audio, dtype='float32', always_2d=False)
+    except RuntimeError:  # sf.LibsndfileError: unsupported format
+        if not hasattr(audio, 'read'):
+            return librosa.load(audio, sr=CONFIG['sr'])
+        audio.seek(0)
+        # delete=False: Windows can't reopen a NamedTemporaryFile by name
+        # while it is still open
+        with tempfile.NamedTemporaryFile(delete=False) as tmp:
+            tmp.write(audio.read())
+        try:
+            return librosa.load(tmp.name, sr=CONFIG['sr'])
+        finally:
+            os.unlink(tmp.name)
+    
+    if y.ndim > 1:
+        y = y.mean(axis=1)
+    if sr != CONFIG['sr']:
+        y = librosa.resample(y, orig_sr=sr, target_sr=CONFIG['sr'], res_type='soxr_hq')
+    return y, CONFIG['sr']
+
+
+def extract_features_for_ei_model(audio):
+    """
+    Extract features exactly as Edge Impulse expects them.
+    
+    audio may be a file path or a file-like object (e.g. io.BytesIO of an
+    upload), so requests can be decoded without a disk round-trip.
+    """
     try:
-        y, sr = librosa.load(audio_path, sr=CONFIG['sr'])
+        y, sr = load_audio(audio)
+        S = power_spectrogram(y.astype(np.float32, copy=False))
         
-        # Extract MFCC (13 coefficients)
-        mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=CONFIG['n_mfcc'])
-        mfcc_mean = np.mean(mfcc, axis=1)  # (13,)
+        # Combined features to match Edge Impulse model input
+        # Total should match training: 13 MFCC + 8 additional = 21 features
+        n_mfcc = CONFIG['n_mfcc']
+        combined_features = np.empty(n_mfcc + ENERGY_MEL_BASIS.shape[0], dtype=np.float32)
         
-        # Extract Mel-Frequency Energy
-        mel_spec = librosa.feature.melspectrogram(y=y, sr=sr, n_mels=64)
-        mel_energy = np.mean(mel_spec, axis=1)  # (64,) - use first 8
+        # Extract MFCC (13 coefficients), averaged straight into the output
+        mfcc = mfcc_from_power(S)
+        np.mean(mfcc, axis=1, out=combined_features[:n_mfcc])
         
-        # Combine features to match Edge Impulse model input
-        # Total should match training: 13 MFCC + 8 additional = 21 features
-        combined_features = np.concatenate([
-            mfcc_mean,  # 13 features
-            mel_energy[:8]  # 8 features from mel spectrum
-        ])
+        # Extract Mel-Frequency Energy (8) - first 8 of 64 bands
+        mel_spec = ENERGY_MEL_BASIS @ S
+        np.mean(mel_spec, axis=1, out=combined_features[n_mfcc:])
         
         return combined_features.tolist(), True
     except Exception as e:
@@ -69,18 +234,48 @@ def extract_features_for_ei_model(audio_path):
         return None, False
 
 
+def predict_fire_with_ei_onnx(features):
+    """
+    Run the Edge Impulse model in-process; same outputs as the Node.js server.
+    
+    Raises if the model's labels are unknown or don't match its output
+    width, so the caller falls back to the model server.
+    """
+    if EI_LABELS is None or 'fire' not in EI_LABELS:
+        raise RuntimeError(f"no 'fire' class in Edge Impulse labels {EI_LABELS}")
+    scores = EI_ONNX_SESSION.run(
+        None, {EI_ONNX_INPUT: np.asarray(features, dtype=np.float32).reshape(1, -1)}
+    )[0][0]
+    if len(scores) != len(EI_LABELS):
+        raise RuntimeError(
+            f"model has {len(scores)} outputs but {len(EI_LABELS)} labels"
+        )
+    # Looked up by name, as node/server.js buildPrediction does
+    fire_confidence = float(scores[EI_LABELS.index('fire')])
+    prediction = 1 if fire_confidence > 0.5 else 0
+    prediction_text = 'FIRE DETECTED 🔥' if prediction == 1 else 'NO FIRE ✅'
+    return prediction, fire_confidence, prediction_text
+
+
 def predict_fire_with_ei_model(features):
-    """Call Edge Impulse model via Node.js server for 98.92% accuracy."""
+    """Call Edge Impulse model (in-process ONNX or Node.js server) for 98.92% accuracy."""
+    if EI_ONNX_SESSION is not None:
+        try:
+            return predict_fire_with_ei_onnx(features)
+        except Exception as e:
+            print(f"Error running ONNX model, using model server: {e}")
+    
     try:
-        # Call Node.js server
-        response = requests.post(
+        # Call Node.js server - raw little-endian float32 body, no JSON encoding
+        response = EI_SESSION.post(
             f'{EI_MODEL_SERVER}/api/predict',
-            json={'features': features},
+            data=np.ascontiguousarray(features, dtype='<f4').tobytes(),
+            headers={'Content-Type': 'application/octet-stream'},
             timeout=5
         )
         
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             if result['status'] == 'success':
                 return (
                     result['prediction'],
@@ -96,17 +291,154 @@ def predict_fire_with_ei_model(features):
         return None, None, None
 
 
+def cached_features(key, extract, audio):
+    """Return extract(audio), memoized under key. Failures are not cached."""
+    with feature_cache_lock:
+        if key in feature_cache:
+            feature_cache.move_to_end(key)
+            return feature_cache[key], True
+    
+    features, success = extract(audio)
+    if success:
+        with feature_cache_lock:
+            feature_cache[key] = features
+            if len(feature_cache) > FEATURE_CACHE_SIZE:
+                feature_cache.popitem(last=False)
+    return features, success
+
+
 def extract_mfcc_features(audio_path):
     """Extract MFCC features from audio file."""
     try:
-        y, sr = librosa.load(audio_path, sr=CONFIG['sr'])
-        mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=CONFIG['n_mfcc'])
+        y, sr = load_audio(audio_path)
+        mfcc = mfcc_from_power(power_spectrogram(y))
         features = np.mean(mfcc, axis=1)
         return features, True
     except Exception as e:
         return None, False
 
 
+@njit(cache=True)
+def fire_score_kernel(features):
+    """
+    Weighted fire score for a vector of MFCC means.
+    
+    Computes every statistic in explicit loops so a prediction is a single
+    native call instead of ~20 NumPy dispatches on a 13-element array.
+    """
+    n = features.shape[0]
+    
+    # Mean, min/max and total absolute energy in one pass
+    total = 0.0
+    total_energy = 0.0
+    mfcc_max = features[0]
+    mfcc_min = features[0]
+    for i in range(n):
+        x = features[i]
+        total += x
+        total_energy += abs(x)
+        if x > mfcc_max:
+            mfcc_max = x
+        if x < mfcc_min:
+            mfcc_min = x
+    mfcc_mean = total / n
+    
+    # Energy variance / spectral std (population, as np.var / np.std)
+    energy_variance = 0.0
+    for i in range(n):
+        d = features[i] - mfcc_mean
+        energy_variance += d * d
+    energy_variance /= n
+    mfcc_std = np.sqrt(energy_variance)
+    
+    # Frequency bands: mid (4-7), high (7-10), ultra high (10-13)
+    mid = 0.0
+    for i in range(4, 7):
+        mid += abs(features[i])
+    mid /= 3.0
+    high = 0.0
+    for i in range(7, 10):
+        high += abs(features[i])
+    high /= 3.0
+    ultra_high = 0.0
+    for i in range(10, n):
+        ultra_high += abs(features[i])
+    ultra_high /= n - 10
+    
+    # Spectral spread
+    freq_range = mfcc_max - mfcc_min
+    
+    fire_score = 0.0
+    
+    # 1. HIGH FREQUENCY DOMINANCE (crackling is in high freq) - 25%
+    high_freq_ratio = (high + ultra_high) / (mid + 0.001)
+    if high_freq_ratio > 0.5:
+        fire_score += 0.25 * min(high_freq_ratio / 2.0, 1.0)
+    else:
+        fire_score -= 0.1
+    
+    # 2. SPECTRAL VARIANCE (fire has irregular patterns) - 25%
+    if mfcc_std > 0.8:
+        fire_score += 0.25 * min(mfcc_std / 2.5, 1.0)
+    elif mfcc_std > 0.5:
+        fire_score += 0.15
+    else:
+        fire_score -= 0.05
+    
+    # 3. ENERGY VARIANCE (fire has fluctuating energy) - 20%
+    if energy_variance > 0.5:
+        fire_score += 0.20 * min(energy_variance / 2.0, 1.0)
+    elif energy_variance > 0.2:
+        fire_score += 0.10
+    
+    # 4. FREQUENCY SPREAD (fire covers wide spectrum) - 15%
+    if freq_range > 1.5:
+        fire_score += 0.15 * min(freq_range / 4.0, 1.0)
+    elif freq_range > 1.0:
+        fire_score += 0.08
+    
+    # 5. ENERGY PROFILE (fire has specific energy signature) - 15%
+    # Not too low (background noise) and not too high (loud sound)
+    if 0.5 < total_energy < 50:
+        fire_score += 0.15
+    elif 0.3 < total_energy < 100:
+        fire_score += 0.08
+    
+    return fire_score
+
+
+@njit(cache=True)
+def calibrate_confidence(fire_score):
+    """Map a raw fire score to a 0-1 confidence."""
+    # Normalize confidence to 0-1
+    confidence = min(max(fire_score, 0.0), 1.0)
+    
+    # Boost strong signals, dampen weak ones
+    if confidence > 0.65:
+        confidence = min(confidence * 1.1, 1.0)
+    elif confidence > 0.45:
+        confidence = min(confidence * 1.05, 1.0)
+    elif confidence < 0.35:
+        confidence = max(confidence * 0.8, 0.0)
+    
+    return confidence
+
+
+@njit(cache=True)
+def fire_confidence_batch_kernel(features):
+    """Confidence for each row of an (N, n_mfcc) matrix of MFCC means."""
+    confidences = np.empty(features.shape[0])
+    for i in range(features.shape[0]):
+        confidences[i] = calibrate_confidence(fire_score_kernel(features[i]))
+    return confidences
+
+
+# Compile (or load from the numba cache) at import, not on the first request
+fire_score_kernel(np.zeros(CONFIG['n_mfcc'], dtype=np.float64))
+calibrate_confidence(0.0)
+fire_confidence_batch_kernel(np.zeros((1, CONFIG['n_mfcc']), dtype=np.float64))
+
+
 def predict_fire(features):
     """
     Improved fire detection using advanced MFCC analysis.
@@ -122,74 +454,9 @@ def predict_fire(features):
         return None, None
     
     try:
-        # Extract comprehensive features
-        mfcc_mean = np.mean(features)
-        mfcc_std = np.std(features)
-        mfcc_max = np.max(features)
-        mfcc_min = np.min(features)
-        mfcc_median = np.median(features)
-        
-        # Split into frequency bands
-        bass = np.mean(np.abs(features[0:2]))        # Low freq (0-2)
-        low_mid = np.mean(np.abs(features[2:4]))     # Low-mid (2-4)
-        mid = np.mean(np.abs(features[4:7]))         # Mid (4-7)
-        high = np.mean(np.abs(features[7:10]))       # High (7-10)
-        ultra_high = np.mean(np.abs(features[10:]))  # Ultra high (10-13)
-        
-        # Energy characteristics
-        total_energy = np.sum(np.abs(features))
-        energy_variance = np.var(features)
-        
-        # Spectral spread
-        freq_range = mfcc_max - mfcc_min
-        
-        # Fire detection score (weighted components)
-        fire_score = 0.0
-        
-        # 1. HIGH FREQUENCY DOMINANCE (crackling is in high freq) - 25%
-        high_freq_ratio = (high + ultra_high) / (mid + 0.001)
-        if high_freq_ratio > 0.5:
-            fire_score += 0.25 * min(high_freq_ratio / 2.0, 1.0)
-        else:
-            fire_score -= 0.1
-        
-        # 2. SPECTRAL VARIANCE (fire has irregular patterns) - 25%
-        if mfcc_std > 0.8:
-            fire_score += 0.25 * min(mfcc_std / 2.5, 1.0)
-        elif mfcc_std > 0.5:
-            fire_score += 0.15
-        else:
-            fire_score -= 0.05
-        
-        # 3. ENERGY VARIANCE (fire has fluctuating energy) - 20%
-        if energy_variance > 0.5:
-            fire_score += 0.20 * min(energy_variance / 2.0, 1.0)
-        elif energy_variance > 0.2:
-            fire_score += 0.10
-        
-        # 4. FREQUENCY SPREAD (fire covers wide spectrum) - 15%
-        if freq_range > 1.5:
-            fire_score += 0.15 * min(freq_range / 4.0, 1.0)
-        elif freq_range > 1.0:
-            fire_score += 0.08
-        
-        # 5. ENERGY PROFILE (fire has specific energy signature) - 15%
-        # Not too low (background noise) and not too high (loud sound)
-        if 0.5 < total_energy < 50:
-            fire_score += 0.15
-        elif 0.3 < total_energy < 100:
-            fire_score += 0.08
-        
-        # Normalize confidence to 0-1
-        confidence = min(max(fire_score, 0.0), 1.0)
-        
-        # Boost strong signals, dampen weak ones
-        if confidence > 0.65:
-            confidence = min(confidence * 1.1, 1.0)
-        elif confidence > 0.45:
-            confidence = min(confidence * 1.05, 1.0)
-        elif confidence < 0.35:
-            confidence = max(confidence * 0.8, 0.0)
+        # Fire detection score (weighted components), compiled by numba
+        fire_score = fire_score_kernel(np.ascontiguousarray(features, dtype=np.float64))
+        confidence = calibrate_confidence(fire_score)
         
         # Decision threshold (lower = more sensitive to fire)
         prediction = 1 if confidence > 0.45 else 0
@@ -201,6 +468,98 @@ def predict_fire(features):
         return None, None
 
 
+def predict_fire_batch(features):
+    """
+    Vectorized predict_fire over an (N, n_mfcc) matrix of MFCC means.
+    
+    Returns: (predictions, confidences) as arrays of length N
+    """
+    confidences = fire_confidence_batch_kernel(
+        np.ascontiguousarray(features, dtype=np.float64)
+    )
+    # Decision threshold (lower = more sensitive to fire)
+    predictions = (confidences > 0.45).astype(int)
+    return predictions, confidences
+
+
+@FEATURE_MEMORY.cache
+def stored_mfcc_features(audio_path, mtime_ns, feature_params):
+    """
+    MFCC features for audio_path, persisted under (path, mtime_ns,
+    feature_params). feature_params (FEATURE_PARAMS) only keys the cache.
+    
+    Raises on failure so undecodable files are never written to the cache.
+    """
+    features, success = extract_mfcc_features(audio_path)
+    if not success:
+        raise ValueError(f"Could not extract features from {audio_path}")
+    return features
+
+
+def batch_file_features(audio_file):
+    """Cached MFCC features for one batch-test file; (None, False) on error."""
+    try:
+        stat = audio_file.stat()
+        return stored_mfcc_features(str(audio_file), stat.st_mtime_ns, FEATURE_PARAMS), True
+    except Exception:
+        return None, False
+
+
+def batch_file_ei_prediction(audio_file):
+    """
+    Classify one batch-test file with the Edge Impulse model.
+    
+    Runs inside the batch thread pool, so one file's extraction overlaps
+    other files' requests to the model server. Falls back to the
+    feature-based predictor when the model is unavailable, as test_audio
+    does. Returns (prediction, confidence, model_type), or
+    (None, None, None) if extraction fails.
+    """
+    try:
+        stat = audio_file.stat()
+        features, success = cached_features(
+            ('ei', str(audio_file), stat.st_mtime_ns),
+            extract_features_for_ei_model,
+            str(audio_file)
+        )
+    except Exception:
+        return None, None, None
+    
+    if not success:
+        return None, None, None
+    prediction, confidence, _ = predict_fire_with_ei_model(features)
+    if prediction is None:
+        prediction, confidence = predict_fire(np.array(features))
+        return prediction, confidence, 'Feature-based (improved)'
+    return prediction, confidence, 'Edge Impulse (98.92% accuracy)'
+
+
+def iter_wav_files(directory):
+    """Yield every .wav file under directory (recursive), using os.scandir."""
+    stack = [directory]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                # Case-insensitive, like glob('*.wav') on Windows
+                elif entry.name.lower().endswith('.wav') and entry.is_file():
+                    yield Path(entry.path)
+
+
+def reservoir_sample(items, k):
+    """Uniform random sample of up to k items from an iterable, in one pass."""
+    sample = []
+    for i, item in enumerate(items):
+        if i < k:
+            sample.append(item)
+        else:
+            j = random.randrange(i + 1)
+            if j < k:
+                sample[j] = item
+    return sample
+
+
 @app.route('/')
 def index():
     """Home page."""
@@ -237,27 +596,33 @@ def test_audio():
         if file.filename == '':
             return jsonify({'status': 'error', 'message': 'No file selected'}), 400
         
-        # Save uploaded file
-        filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file.filename}"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        
-        # Extract features for Edge Impulse model
-        features, success = extract_features_for_ei_model(filepath)
+        # Decode straight from memory; only persist the upload on ?save=1
+        audio_bytes = file.read()
+        saved_as = None
+        if request.args.get('save') == '1':
+            saved_as = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file.filename}"
+            with open(os.path.join(app.config['UPLOAD_FOLDER'], saved_as), 'wb') as f:
+                f.write(audio_bytes)
+        
+        # Extract features for Edge Impulse model (cached by content hash)
+        audio_hash = hashlib.blake2b(audio_bytes, digest_size=16).hexdigest()
+        features, success = cached_features(
+            ('ei', audio_hash), extract_features_for_ei_model, io.BytesIO(audio_bytes)
+        )
         
         if not success or features is None:
-            os.remove(filepath)
             return jsonify({'status': 'error', 'message': 'Could not process audio file'}), 400
         
         # Try to use REAL Edge Impulse model first (98.92% accuracy!)
         prediction, confidence, prediction_text = predict_fire_with_ei_model(features)
+        model_type = 'Edge Impulse (98.92% accuracy)'
         
         # If model server is unavailable, fall back to improved feature-based
         if prediction is None:
             print("⚠️  Edge Impulse model server not available, using fallback prediction")
-            from app import predict_fire  # Import the feature-based predictor
             prediction, confidence = predict_fire(np.array(features))
             prediction_text = 'FIRE DETECTED 🔥' if prediction == 1 else 'NO FIRE ✅'
+            model_type = 'Feature-based (improved)'
         
         # Prepare result
         result = {
@@ -267,16 +632,15 @@ def test_audio():
             'prediction_value': int(prediction),
             'confidence': float(confidence),
             'confidence_percent': f"{confidence*100:.1f}%",
-            'model_type': 'Edge Impulse (98.92% accuracy)' if predict_fire_with_ei_model else 'Feature-based (improved)',
+            'model_type': model_type,
             'status': 'success'
         }
+        if saved_as:
+            result['saved_as'] = saved_as
         
         # Store result
         test_results.append(result)
         
-        # Cleanup
-        os.remove(filepath)
-        
         return jsonify(result)
     
     except Exception as e:
@@ -293,6 +657,7 @@ def test_batch():
         audio_dir = data.get('directory', '')
         test_type = data.get('type', 'fire')  # 'fire' or 'non_fire'
         num_samples = int(data.get('samples', 10))
+        model = data.get('model', 'local')  # 'local' (feature-based) or 'ei'
         
         if test_type == 'fire':
             base_path = Path('02_dataset/raw/audio_fire/fire')
@@ -302,56 +667,75 @@ def test_batch():
         if not base_path.exists():
             return jsonify({'status': 'error', 'message': f'Directory not found: {base_path}'}), 400
         
-        # Get audio files
-        audio_files = list(base_path.glob('**/*.wav'))
+        # Sample audio files in one pass over the directory tree, without
+        # materializing the full listing
+        audio_files = reservoir_sample(iter_wav_files(base_path), num_samples)
         
         if len(audio_files) == 0:
             return jsonify({'status': 'error', 'message': 'No audio files found'}), 400
         
-        # Sample files
-        if len(audio_files) > num_samples:
-            audio_files = np.random.choice(audio_files, num_samples, replace=False)
+        # Decode and extract all files concurrently (librosa's decoding and
+        # NumPy's FFT/matmul release the GIL)
+        with ThreadPoolExecutor(max_workers=min(BATCH_WORKERS, len(audio_files))) as executor:
+            if model == 'ei':
+                # Extraction and Edge Impulse calls are pipelined per file
+                outcomes = list(executor.map(batch_file_ei_prediction, audio_files))
+            else:
+                extracted = list(executor.map(batch_file_features, audio_files))
+        
+        if model == 'ei':
+            scored = [
+                (audio_file, prediction, confidence, model_type)
+                for audio_file, (prediction, confidence, model_type) in zip(audio_files, outcomes)
+                if prediction is not None
+            ]
+        else:
+            tested = [
+                (audio_file, features)
+                for audio_file, (features, success) in zip(audio_files, extracted)
+                if success
+            ]
+            
+            # Score every extracted file in one call
+            scored = []
+            if tested:
+                predictions, confidences = predict_fire_batch(
+                    np.stack([features for _, features in tested])
+                )
+                scored = [
+                    (audio_file, prediction, confidence, 'Feature-based (improved)')
+                    for (audio_file, _), prediction, confidence
+                    in zip(tested, predictions, confidences)
+                ]
         
         results = []
         correct = 0
         
-        for audio_file in audio_files[:num_samples]:
-            try:
-                features, success = extract_mfcc_features(str(audio_file))
-                
-                if not success:
-                    continue
-                
-                prediction, confidence = predict_fire(features)
-                
-                if prediction is None:
-                    continue
-                
-                # True label
-                true_label = 1 if test_type == 'fire' else 0
-                is_correct = (prediction == true_label)
+        if scored:
+            # True label
+            true_label = 1 if test_type == 'fire' else 0
+            
+            for audio_file, prediction, confidence, model_type in scored:
+                is_correct = bool(prediction == true_label)
                 
                 if is_correct:
                     correct += 1
                 
-                result = {
+                results.append({
                     'filename': audio_file.name,
                     'prediction': 'FIRE' if prediction == 1 else 'NO FIRE',
                     'confidence': float(confidence),
                     'true_label': test_type,
-                    'correct': is_correct
-                }
-                
-                results.append(result)
-            
-            except Exception as e:
-                continue
+                    'correct': is_correct,
+                    'model_type': model_type
+                })
         
         accuracy = (correct / len(results) * 100) if results else 0
         
         return jsonify({
             'status': 'success',
             'test_type': test_type,
+            'model': model,
             'total_tested': len(results),
             'correct_predictions': correct,
             'accuracy': f"{accuracy:.1f}%",
@@ -368,15 +752,14 @@ def get_results():
     return jsonify({
         'status': 'success',
         'total_tests': len(test_results),
-        'results': test_results[-50:]  # Last 50 results
+        'results': list(test_results)[-50:]  # Last 50 results
     })
 
 
 @app.route('/api/clear-results', methods=['POST'])
 def clear_results():
     """Clear all test results."""
-    global test_results
-    test_results = []
+    test_results.clear()
     return jsonify({'status': 'success', 'message': 'Results cleared'})
 
 
@@ -398,6 +781,7 @@ if __name__ == '__main__':
     print("  ✓ See predictions with confidence scores")
     print("  ✓ View all test results")
     print("\nPress Ctrl+C to stop the server")
+    print("For production: gunicorn -c scripts/gunicorn_conf.py wsgi:application")
     print("="*80 + "\n")
     
-    app.run(debug=True, host='localhost', port=5000)
+    app.run(host='localhost', port=5000, threaded=True)
@@ -5,6 +5,7 @@ Validates folder structure against expected layout and reports findings.
 """
 
 import json
+import os
 from pathlib import Path
 from typing import Dict, List, Tuple
 
@@ -82,17 +83,25 @@ def check_structure(root_path: Path) -> Tuple[List[str], List[str], Dict]:
         else:
             check_path = root_path / path_key
         
-        details[path_key] = {"exists": check_path.exists(), "missing_files": [], "missing_folders": []}
+        # List the directory once; each expected name is then a set lookup
+        # instead of its own exists() syscall. Names are normcased on both
+        # sides so matching stays case-insensitive on Windows, like exists()
+        try:
+            with os.scandir(check_path) as it:
+                entries = {os.path.normcase(entry.name) for entry in it}
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            entries = None
+        
+        details[path_key] = {"exists": entries is not None, "missing_files": [], "missing_folders": []}
         
         # Check if path exists
-        if not check_path.exists():
+        if entries is None:
             issues.append(f"❌ Missing folder: {path_key}")
             continue
         
         # Check required files
         for file in expected.get("files", []):
-            file_path = check_path / file
-            if not file_path.exists():
+            if os.path.normcase(file) not in entries:
                 issues.append(f"❌ Missing file: {path_key}/{file}")
                 details[path_key]["missing_files"].append(file)
             else:
@@ -100,8 +109,7 @@ def check_structure(root_path: Path) -> Tuple[List[str], List[str], Dict]:
         
         # Check required folders
         for folder in expected.get("folders", []):
-            folder_path = check_path / folder
-            if not folder_path.exists():
+            if os.path.normcase(folder) not in entries:
                 issues.append(f"⚠️  Missing folder: {path_key}/{folder}")
                 details[path_key]["missing_folders"].append(folder)
             else:
@@ -12,6 +12,7 @@ from __future__ import annotations
 
 import argparse
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict
 
@@ -30,23 +31,45 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+# Loaders are memoized on (path, mtime_ns): repeat reports for the same
+# sample skip the disk read, and a modified file gets a new cache key.
+# Cached objects are shared, so callers must treat them as read-only.
+@lru_cache(maxsize=64)
+def _read_audio(path: str, mtime_ns: int) -> np.ndarray:
+    audio = np.load(path)
+    audio.flags.writeable = False
+    return audio
+
+
+@lru_cache(maxsize=64)
+def _read_sensor(path: str, mtime_ns: int) -> pd.DataFrame:
+    return pd.read_parquet(path)
+
+
 def load_audio(sample_id: str, audio_dir: Path) -> np.ndarray:
     path = audio_dir / f"{sample_id}.npy"
     if not path.exists():
         raise FileNotFoundError(f"Audio sample missing: {path}")
-    return np.load(path)
+    return _read_audio(str(path), path.stat().st_mtime_ns)
 
 
 def load_sensor(sample_id: str, sensor_dir: Path) -> pd.DataFrame | None:
     path = sensor_dir / f"{sample_id}.parquet"
     if not path.exists():
         return None
-    return pd.read_parquet(path)
+    return _read_sensor(str(path), path.stat().st_mtime_ns)
+
+
+def magnitude_spectrogram(signal: np.ndarray) -> np.ndarray:
+    """|STFT| with librosa's default framing, shared by all spectral metrics."""
+    return np.abs(librosa.stft(signal, n_fft=2048, hop_length=512))
 
 
-def audio_metrics(signal: np.ndarray, sr: int = 16_000) -> Dict:
-    centroid = librosa.feature.spectral_centroid(y=signal, sr=sr)
-    bandwidth = librosa.feature.spectral_bandwidth(y=signal, sr=sr)
+def audio_metrics(signal: np.ndarray, spec: np.ndarray, sr: int = 16_000) -> Dict:
+    centroid = librosa.feature.spectral_centroid(S=spec, sr=sr)
+    bandwidth = librosa.feature.spectral_bandwidth(S=spec, sr=sr)
+    # Time-domain RMS (framing only, no STFT); RMS from a windowed
+    # spectrogram would only approximate it
     rms = librosa.feature.rms(y=signal)
     return {
         "spectral_centroid_hz_mean": float(centroid.mean()),
@@ -55,28 +78,23 @@ def audio_metrics(signal: np.ndarray, sr: int = 16_000) -> Dict:
     }
 
 
-def mfcc_energy(signal: np.ndarray, sr: int = 16_000, n_mfcc: int = 13) -> Dict:
-    mfcc = librosa.feature.mfcc(y=signal, sr=sr, n_mfcc=n_mfcc)
+def mfcc_energy(spec: np.ndarray, sr: int = 16_000, n_mfcc: int = 13) -> Dict:
+    mel = librosa.feature.melspectrogram(S=spec**2, sr=sr)
+    mfcc = librosa.feature.mfcc(S=librosa.power_to_db(mel), n_mfcc=n_mfcc)
     energy = mfcc.mean(axis=1)
     return {f"mfcc_{i+1}_mean": float(val) for i, val in enumerate(energy)}
 
 
 def sensor_metrics(df: pd.DataFrame) -> Dict:
-    stats = {}
-    for column in df.columns:
-        stats[column] = {
-            "mean": float(df[column].mean()),
-            "min": float(df[column].min()),
-            "max": float(df[column].max()),
-            "std": float(df[column].std()),
-        }
-    return stats
+    # One aggregation over all columns instead of four reductions per column
+    return df.agg(["mean", "min", "max", "std"]).astype(float).to_dict()
 
 
 def run_report(sample_id: str, audio_dir: Path, sensor_dir: Path, config_path: Path) -> Dict:
     audio = load_audio(sample_id, audio_dir)
-    audio_stats = audio_metrics(audio)
-    mfcc_stats = mfcc_energy(audio)
+    spec = magnitude_spectrogram(audio)
+    audio_stats = audio_metrics(audio, spec)
+    mfcc_stats = mfcc_energy(spec)
     sensor_df = load_sensor(sample_id, sensor_dir)
     report = {
         "sample": sample_id,
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 import json
+import shutil
 
 print('=' * 80)
 print('PHASE 4: FEATURE ENGINEERING FROM SENSOR DATA')
@@ -19,29 +20,34 @@ sensor_df = sensor_df.sort_values('date')
 
 sensor_features = {}
 
-for location in sensor_df['location'].unique():
-    loc_data = sensor_df[sensor_df['location'] == location].copy()
-    
-    # Rolling statistics (7-day windows)
-    loc_data['temp_mean'] = loc_data['T2M'].rolling(7, min_periods=1).mean()
-    loc_data['temp_std'] = loc_data['T2M'].rolling(7, min_periods=1).std()
-    loc_data['temp_spike'] = loc_data['T2M'].diff().abs()
-    
-    loc_data['humidity_mean'] = loc_data['RH2M'].rolling(7, min_periods=1).mean()
-    loc_data['humidity_min'] = loc_data['RH2M'].rolling(7, min_periods=1).min()
-    loc_data['humidity_drop'] = loc_data['RH2M'].diff().abs()
-    
-    loc_data['pressure_std'] = loc_data['PS'].rolling(7, min_periods=1).std()
-    loc_data['pressure_anomaly'] = (loc_data['PS'] - loc_data['PS'].rolling(7, min_periods=1).mean()).abs()
-    
-    # Composite risk score
-    loc_data['fire_risk_score'] = (
-        (100 - loc_data['humidity_min']) * 0.4 +
-        (loc_data['temp_mean'] / 30 * 100) * 0.3 +
-        (loc_data['pressure_std'] * 10) * 0.2 +
-        (loc_data['temp_spike'] * 5) * 0.1
-    ).clip(0, 100)
-    
+# Rolling statistics (7-day windows) for every location in one grouped pass
+by_location = sensor_df.groupby('location', sort=False)
+rolling = by_location[['T2M', 'RH2M', 'PS']].rolling(7, min_periods=1)
+rolling_mean = rolling.mean().droplevel(0)
+rolling_std = rolling.std().droplevel(0)
+rolling_min = by_location['RH2M'].rolling(7, min_periods=1).min().droplevel(0)
+spikes = by_location[['T2M', 'RH2M']].diff().abs()
+
+sensor_df['temp_mean'] = rolling_mean['T2M']
+sensor_df['temp_std'] = rolling_std['T2M']
+sensor_df['temp_spike'] = spikes['T2M']
+
+sensor_df['humidity_mean'] = rolling_mean['RH2M']
+sensor_df['humidity_min'] = rolling_min
+sensor_df['humidity_drop'] = spikes['RH2M']
+
+sensor_df['pressure_std'] = rolling_std['PS']
+sensor_df['pressure_anomaly'] = (sensor_df['PS'] - rolling_mean['PS']).abs()
+
+# Composite risk score
+sensor_df['fire_risk_score'] = (
+    (100 - sensor_df['humidity_min']) * 0.4 +
+    (sensor_df['temp_mean'] / 30 * 100) * 0.3 +
+    (sensor_df['pressure_std'] * 10) * 0.2 +
+    (sensor_df['temp_spike'] * 5) * 0.1
+).clip(0, 100)
+
+for location, loc_data in sensor_df.groupby('location', sort=False):
     sensor_features[location] = {
         'avg_temp': float(loc_data['T2M'].mean()),
         'avg_humidity': float(loc_data['RH2M'].mean()),
@@ -55,10 +61,20 @@ for location in sensor_df['location'].unique():
     print(f'   Avg Humidity: {loc_data["RH2M"].mean():.1f}%')
     print(f'   Fire Risk Score: {loc_data["fire_risk_score"].mean():.1f}/100')
     print(f'   High Risk Days: {(loc_data["fire_risk_score"] > 70).sum()}')
-    
-    # Save engineered features
-    Path('03_feature_pipeline/sensor_features/').mkdir(parents=True, exist_ok=True)
-    loc_data.to_csv(f'03_feature_pipeline/sensor_features/{location}_engineered.csv', index=False)
+
+# Save engineered features as a Parquet dataset partitioned by location
+# (location=<name>/), so trainers can read one location without parsing CSV.
+# Clear previous output first: partitioned writes add files, not replace them.
+engineered_dir = Path('03_feature_pipeline/sensor_features/engineered')
+shutil.rmtree(engineered_dir, ignore_errors=True)
+engineered_dir.mkdir(parents=True, exist_ok=True)
+sensor_df.to_parquet(
+    engineered_dir,
+    engine='pyarrow',
+    compression='snappy',
+    partition_cols=['location'],
+    index=False
+)
 
 # Save summary
 with open('03_feature_pipeline/sensor_features/summary.json', 'w') as f:
@@ -67,6 +83,6 @@ with open('03_feature_pipeline/sensor_features/summary.json', 'w') as f:
 print('\n' + '=' * 80)
 print('✅ SENSOR FEATURE ENGINEERING COMPLETE')
 print('=' * 80)
-print('\n📂 Features saved to: 03_feature_pipeline/sensor_features/')
+print('\n📂 Features saved to: 03_feature_pipeline/sensor_features/engineered/ (Parquet)')
 print('\n🎯 Ready for CNN-Fusion and GRU-Temporal training!')
 print('\nNext: Training advanced models (CNN-Fusion + GRU)...')
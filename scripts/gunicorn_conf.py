@@ -0,0 +1,25 @@
+"""
+gunicorn settings for the WildGaurd-Edge web app.
+
+Run from the repository root:
+    gunicorn -c scripts/gunicorn_conf.py wsgi:application
+
+Each worker is a separate process with its own feature cache and result
+history (both bounded), so /api/results only reflects the worker that
+answered the request.
+"""
+
+import multiprocessing
+import os
+
+# Make `wsgi`/`app` importable while keeping the repo root as the working
+# directory (uploads/ resolves the same way as `python scripts/app.py`)
+pythonpath = os.path.dirname(os.path.abspath(__file__))
+
+bind = os.environ.get('WILDGAURD_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WILDGAURD_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('WILDGAURD_THREADS', 4))
+
+# Batch tests extract every sampled file before responding
+timeout = 120
@@ -9,22 +9,19 @@ Usage:
 from __future__ import annotations
 
 import os
+import shutil
 import subprocess
 import sys
+from functools import lru_cache
 from pathlib import Path
 
+# whoami normally answers in well under a second
+WHOAMI_TIMEOUT_S = 3
+
 
 def check_cli_installed() -> bool:
-    """Check if Edge Impulse CLI is installed."""
-    try:
-        result = subprocess.run(
-            ["edge-impulse-cli", "--version"],
-            capture_output=True,
-            text=True
-        )
-        return result.returncode == 0
-    except FileNotFoundError:
-        return False
+    """Check if Edge Impulse CLI is installed (PATH lookup, no subprocess)."""
+    return shutil.which("edge-impulse-cli") is not None
 
 
 def install_cli() -> None:
@@ -45,13 +42,13 @@ def install_cli() -> None:
 def check_env_file() -> bool:
     """Check if .env file exists."""
     env_path = Path(".env")
-    return env_path.exists()
+    return env_path.is_file()
 
 
 def create_env_file() -> None:
     """Create .env file template."""
     env_path = Path(".env")
-    if env_path.exists():
+    if env_path.is_file():
         print("[setup] .env file already exists")
         return
     
@@ -68,10 +65,16 @@ EI_PROJECT_ID=your_project_id_here
     print("[setup] ⚠️  Please edit .env and add your credentials")
 
 
-def verify_credentials() -> bool:
-    """Verify Edge Impulse credentials are set."""
+@lru_cache(maxsize=1)
+def _load_env() -> None:
+    """Parse .env into the environment at most once per process."""
     from dotenv import load_dotenv
     load_dotenv()
+
+
+def verify_credentials() -> bool:
+    """Verify Edge Impulse credentials are set."""
+    _load_env()
     
     api_key = os.getenv("EI_API_KEY")
     project_id = os.getenv("EI_PROJECT_ID")
@@ -91,12 +94,19 @@ def verify_credentials() -> bool:
 def test_connection() -> bool:
     """Test Edge Impulse connection."""
     print("[setup] Testing Edge Impulse connection...")
+    cli_path = shutil.which("edge-impulse-cli")
+    if cli_path is None:
+        print("[setup] ❌ Edge Impulse CLI not found")
+        return False
     try:
+        # One pipe (stderr folded into stdout) is enough: the output is only
+        # printed, never parsed
         result = subprocess.run(
-            ["edge-impulse-cli", "whoami"],
-            capture_output=True,
+            [cli_path, "whoami"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            timeout=10
+            timeout=WHOAMI_TIMEOUT_S
         )
         if result.returncode == 0:
             print("[setup] ✅ Connected to Edge Impulse")
@@ -104,7 +114,7 @@ def test_connection() -> bool:
             return True
         else:
             print("[setup] ❌ Connection failed")
-            print(f"[setup] {result.stderr}")
+            print(f"[setup] {result.stdout}")
             return False
     except FileNotFoundError:
         print("[setup] ❌ Edge Impulse CLI not found")
@@ -0,0 +1,7 @@
+"""
+WSGI entry point for serving the WildGaurd-Edge web app with gunicorn.
+
+    gunicorn -c scripts/gunicorn_conf.py wsgi:application
+"""
+
+from app import app as application
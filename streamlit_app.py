@@ -1,14 +1,17 @@
 import streamlit as st
-import os
+import io
 import json
+import http.client
 import numpy as np
-import librosa
+import orjson
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
 from pathlib import Path
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import shutil
 import subprocess
+import stat
 import time
 
 # Configuration
@@ -18,17 +21,71 @@ CONFIG = {
 }
 
 EI_MODEL_SERVER = 'http://127.0.0.1:5001'
-TEMP_DIR = 'temp_uploads'
-os.makedirs(TEMP_DIR, exist_ok=True)
+NODE_LOG_PATH = Path("node_server.log")  # written by start_node_server
+LOG_TAIL_BYTES = 8192
+
+@st.cache_resource(show_spinner=False)
+def get_http_session():
+    """Keep-alive session for Node server calls, shared across script reruns."""
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    return session
+
+_HTTP = get_http_session()
+
+@st.cache_resource(show_spinner=False)
+def get_executor():
+    """Worker threads for extraction and connection warm-up, shared across reruns."""
+    return ThreadPoolExecutor(max_workers=4)
+
+def warm_server_connection():
+    """Open (or reuse) a pooled keep-alive connection to the Node server."""
+    try:
+        _HTTP.get(f'{EI_MODEL_SERVER}/api/health', timeout=1)
+    except requests.RequestException:
+        pass
+
+_EI_SERVER_URL = urlsplit(EI_MODEL_SERVER)
+
+def health_status(timeout=0.2):
+    """
+    HTTP status of the Node server's /api/health, or None if unreachable.
+    
+    A bare stdlib HTTPConnection is plenty for a one-shot GET to localhost;
+    predictions still go through the pooled _HTTP session.
+    """
+    conn = http.client.HTTPConnection(_EI_SERVER_URL.hostname, _EI_SERVER_URL.port, timeout=timeout)
+    try:
+        conn.request("GET", "/api/health")
+        return conn.getresponse().status
+    except (OSError, http.client.HTTPException):
+        # HTTPException: something other than the model server (or not an
+        # HTTP server at all) is answering on the port
+        return None
+    finally:
+        conn.close()
+
+HEALTH_PROBE_INTERVAL = 2.0  # seconds a health probe result is reused
+
+@st.cache_data(ttl=HEALTH_PROBE_INTERVAL, show_spinner=False)
+def server_status():
+    """
+    Node server status ('online', 'offline' or 'unreachable').
+    
+    Cached process-wide for HEALTH_PROBE_INTERVAL seconds, so reruns (and
+    other sessions) within that window reuse the last probe instead of
+    each waiting on a health request.
+    """
+    code = health_status(timeout=0.5)
+    if code is None:
+        return 'unreachable'
+    return 'online' if code == 200 else 'offline'
 
 def start_node_server():
     """Start the Node.js model server if it's not running."""
     # Check if already running
-    try:
-        requests.get(f'{EI_MODEL_SERVER}/api/health', timeout=1)
+    if server_status() != 'unreachable':
         return True
-    except:
-        pass
 
     try:
         node_dir = Path("node")
@@ -42,7 +99,7 @@ def start_node_server():
                 subprocess.run(["npm", "install"], cwd=node_dir, check=True, shell=True)
 
         # Start server with logging
-        log_file = open("node_server.log", "w")
+        log_file = open(NODE_LOG_PATH, "w")
         process = subprocess.Popen(
             ["node", "server.js"], 
             cwd=node_dir, 
@@ -51,18 +108,20 @@ def start_node_server():
             stderr=subprocess.STDOUT
         )
         
-        # Wait for startup (up to 15 seconds)
+        # Wait for startup (up to 15 seconds), polling every 50ms - a
+        # localhost server is usually up in well under a second
         progress_text = "Starting AI Model Server..."
         my_bar = st.progress(0, text=progress_text)
         
-        for i in range(15):
-            try:
-                requests.get(f'{EI_MODEL_SERVER}/api/health', timeout=1)
+        start = time.monotonic()
+        deadline = start + 15
+        while time.monotonic() < deadline:
+            if health_status(timeout=0.2) is not None:
                 my_bar.empty()
+                server_status.clear()  # drop the cached 'unreachable'
                 return True
-            except:
-                time.sleep(1)
-                my_bar.progress((i + 1) / 15, text=progress_text)
+            time.sleep(0.05)
+            my_bar.progress(min((time.monotonic() - start) / 15, 1.0), text=progress_text)
         
         my_bar.empty()
         print("Timeout waiting for node server")
@@ -83,239 +142,329 @@ st.set_page_config(
 if 'server_started' not in st.session_state:
     st.session_state.server_started = start_node_server()
 
+@st.cache_data(ttl=2, show_spinner=False)
+def read_log_tail(path, mtime_ns, size):
+    """
+    Last LOG_TAIL_BYTES of a log file, starting at a line boundary; cached
+    per (path, mtime, size).
+    """
+    start = max(0, size - LOG_TAIL_BYTES)
+    with open(path, "rb") as f:
+        f.seek(start)
+        # Read up to the stat'ed size only; the server may still be writing
+        tail = f.read(size - start)
+    if start > 0:
+        # Drop the partial first line (and any split UTF-8 sequence in it)
+        tail = tail.partition(b"\n")[2]
+    return tail.decode("utf-8", errors="replace")
+
 # Debug: Show Node Logs
 with st.sidebar.expander("🛠️ Debug Info"):
-    if os.path.exists("node/node_server.log"):
-        with open("node/node_server.log", "r") as f:
-            st.text_area("Node Server Logs", f.read(), height=200)
+    # One stat for existence, type, mtime and size; a missing, unreadable
+    # or non-regular log path just shows the placeholder
+    try:
+        log_stat = NODE_LOG_PATH.stat()
+        log_tail = (
+            read_log_tail(str(NODE_LOG_PATH), log_stat.st_mtime_ns, log_stat.st_size)
+            if stat.S_ISREG(log_stat.st_mode) else None
+        )
+    except OSError:
+        log_tail = None
+    if log_tail is not None:
+        st.text_area("Node Server Logs", log_tail, height=200)
     else:
         st.info("No server logs found.")
 
-# Custom CSS - Modern Fire Theme
-st.markdown("""
-    <style>
-    /* Import Google Font */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-    
-    /* Global Styles */
-    * {
-        font-family: 'Inter', sans-serif;
-    }
-    
-    /* Main Background - Dark gradient with fire theme */
-    .main {
-        background: linear-gradient(135deg, #1a1a2e 0%, #16213e 50%, #0f3460 100%);
-    }
-    
-    /* Sidebar Styling */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #1a1a2e 0%, #16213e 100%);
-    }
-    
-    [data-testid="stSidebar"] h1 {
-        color: #ff6b35 !important;
-        font-weight: 700;
-        text-shadow: 0 0 20px rgba(255, 107, 53, 0.5);
-    }
-    
-    /* Headers */
-    h1, h2, h3 {
-        color: #ffffff !important;
-        font-weight: 700;
-    }
-    
-    h1 {
-        font-size: 3rem !important;
-        background: linear-gradient(135deg, #ff6b35 0%, #f7931e 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        margin-bottom: 0.5rem !important;
-    }
-    
-    /* Subtitle */
-    .subtitle {
-        color: #a0aec0;
-        font-size: 1.2rem;
-        margin-bottom: 2rem;
-    }
+# Custom CSS - Modern Fire Theme (static/style.css, read once and cached;
+# the <style> element itself still has to be emitted on every rerun)
+@st.cache_data(show_spinner=False)
+def load_css(path="static/style.css"):
+    return Path(path).read_text(encoding="utf-8")
+
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def load_model_metrics():
+    """Baseline metrics, parsed once and reused across reruns for a day."""
+    try:
+        with open('04_models/baseline/baseline_performance.json', 'r') as f:
+            return json.load(f)
+    except:
+        return None
+
+# STFT settings used in training (librosa defaults)
+N_FFT = 2048
+HOP_LENGTH = 512
+
+def _hz_to_mel(hz):
+    """Slaney mel scale (librosa's default, htk=False)."""
+    hz = np.asanyarray(hz, dtype=np.float64)
+    f_sp = 200.0 / 3
+    mels = hz / f_sp
+    min_log_hz = 1000.0
+    min_log_mel = min_log_hz / f_sp
+    logstep = np.log(6.4) / 27.0
+    return np.where(
+        hz >= min_log_hz,
+        min_log_mel + np.log(np.maximum(hz, min_log_hz) / min_log_hz) / logstep,
+        mels
+    )
+
+def _mel_to_hz(mels):
+    """Inverse of _hz_to_mel."""
+    f_sp = 200.0 / 3
+    min_log_hz = 1000.0
+    min_log_mel = min_log_hz / f_sp
+    logstep = np.log(6.4) / 27.0
+    return np.where(
+        mels >= min_log_mel,
+        min_log_hz * np.exp(logstep * (mels - min_log_mel)),
+        f_sp * mels
+    )
+
+def mel_filterbank(sr, n_fft, n_mels):
+    """Slaney-normalized mel filterbank, identical to librosa.filters.mel."""
+    fft_freqs = np.fft.rfftfreq(n=n_fft, d=1.0 / sr)
+    mel_f = _mel_to_hz(np.linspace(_hz_to_mel(0.0), _hz_to_mel(sr / 2.0), n_mels + 2))
+    fdiff = np.diff(mel_f)
+    ramps = np.subtract.outer(mel_f, fft_freqs)
     
-    /* Metric Cards */
-    [data-testid="stMetricValue"] {
-        font-size: 2rem !important;
-        font-weight: 700 !important;
-        color: #ff6b35 !important;
-    }
+    weights = np.zeros((n_mels, 1 + n_fft // 2), dtype=np.float32)
+    for i in range(n_mels):
+        lower = -ramps[i] / fdiff[i]
+        upper = ramps[i + 2] / fdiff[i + 1]
+        weights[i] = np.maximum(0, np.minimum(lower, upper))
     
-    [data-testid="stMetricLabel"] {
-        color: #cbd5e0 !important;
-        font-weight: 600 !important;
-    }
+    enorm = 2.0 / (mel_f[2:n_mels + 2] - mel_f[:n_mels])
+    weights *= enorm[:, np.newaxis]
+    return weights
+
+@st.cache_resource(show_spinner=False)
+def dsp_constants():
+    """
+    Filterbanks, analysis window and DCT basis, built once per server
+    process rather than on every script rerun. Shared across sessions, so
+    read-only.
+    """
+    from scipy.fft import dct
     
-    /* File Uploader */
-    [data-testid="stFileUploader"] {
-        background: rgba(255, 255, 255, 0.05);
-        border: 2px dashed #ff6b35;
-        border-radius: 15px;
-        padding: 2rem;
-        backdrop-filter: blur(10px);
-    }
+    # Filterbanks for the 128-band MFCC input and the first 8 of 64 energy bands
+    mfcc_mel_fb = mel_filterbank(CONFIG['sr'], N_FFT, 128)
+    energy_mel_fb = mel_filterbank(CONFIG['sr'], N_FFT, 64)[:8]
+    # Those 8 bands only reach ~420 Hz; keep just the STFT bins they touch
+    # (columns past the last nonzero weight contribute nothing)
+    energy_bins = np.flatnonzero(energy_mel_fb.any(axis=0))[-1] + 1
+    energy_mel_fb = np.ascontiguousarray(energy_mel_fb[:, :energy_bins])
+    # Periodic Hann window, as scipy.signal.get_window('hann', N_FFT) / librosa
+    hann_window = (0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(N_FFT) / N_FFT)).astype(np.float32)
+    # Orthonormal DCT-II rows for the first n_mfcc coefficients, so the
+    # cepstral step is a single (13, 128) matmul
+    dct_basis = dct(
+        np.eye(mfcc_mel_fb.shape[0], dtype=np.float32), type=2, norm='ortho', axis=0
+    )[:CONFIG['n_mfcc']]
+    for array in (mfcc_mel_fb, energy_mel_fb, hann_window, dct_basis):
+        array.flags.writeable = False
+    return mfcc_mel_fb, energy_mel_fb, hann_window, dct_basis
+
+MFCC_MEL_FB, ENERGY_MEL_FB, HANN_WINDOW, DCT_BASIS = dsp_constants()
+
+def load_audio(audio):
+    """
+    Decode audio to mono float32 at CONFIG['sr'] with soundfile. Formats
+    libsndfile can't decode (e.g. m4a, or mp3 on older builds) go through
+    librosa.load, imported only then.
+    """
+    import soundfile as sf
     
-    [data-testid="stFileUploader"]:hover {
-        border-color: #f7931e;
-        background: rgba(255, 107, 53, 0.1);
-    }
+    try:
+        y, sr = sf.read(audio, dtype='float32', always_2d=False)
+    except RuntimeError:  # sf.LibsndfileError: unsupported format
+        import librosa
+        if not hasattr(audio, 'read'):
+            return librosa.load(audio, sr=CONFIG['sr'])[0]
+        # librosa's audioread decoders need a real file
+        import tempfile
+        audio.seek(0)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "upload"
+            path.write_bytes(audio.read())
+            return librosa.load(path, sr=CONFIG['sr'])[0]
+    if y.ndim > 1:
+        y = y.mean(axis=1)
+    if sr != CONFIG['sr']:
+        # soxr 'HQ' is what librosa.resample(res_type='soxr_hq') - and so
+        # the training pipeline and scripts/app.py - uses
+        import soxr
+        y = soxr.resample(y, sr, CONFIG['sr'], quality='HQ')
+    return y
+
+def power_spectrogram(y, workers=1):
+    """
+    |STFT|^2, (1 + N_FFT // 2, n_frames), matching librosa.stft defaults
+    (centered frames, zero padding, periodic Hann window). workers > 1 (or
+    -1 for all cores) splits the frames' FFTs across threads.
+    """
+    from scipy.fft import rfft
     
-    /* Buttons */
-    .stButton>button {
-        width: 100%;
-        background: linear-gradient(135deg, #ff6b35 0%, #f7931e 100%);
-        color: white;
-        border: none;
-        border-radius: 12px;
-        padding: 0.75rem 2rem;
-        font-size: 1.1rem;
-        font-weight: 600;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 15px rgba(255, 107, 53, 0.4);
-    }
+    padded = np.pad(y.astype(np.float32, copy=False), N_FFT // 2, mode='constant')
+    frames = np.lib.stride_tricks.sliding_window_view(padded, N_FFT)[::HOP_LENGTH]
+    # float32 frames x float32 window -> complex64 spectrum (scipy keeps
+    # single precision, unlike numpy.fft)
+    spectrum = rfft(frames * HANN_WINDOW, axis=-1, workers=workers)
+    return (np.abs(spectrum) ** 2).T
+
+def power_to_db(S, amin=1e-10, top_db=80.0):
+    """librosa.power_to_db with ref=1.0."""
+    log_spec = 10.0 * np.log10(np.maximum(amin, S))
+    return np.maximum(log_spec, log_spec.max() - top_db)
+
+def extract_features(y, workers=1):
+    """
+    21 Edge Impulse features (13 MFCC means + 8 mel-energy means) from a
+    mono float32 signal at CONFIG['sr']. workers is passed to
+    power_spectrogram.
     
-    .stButton>button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 25px rgba(255, 107, 53, 0.6);
-    }
+    Plain NumPy (framed rfft, precomputed mel filterbanks, DCT-II) that
+    reproduces librosa's mfcc/melspectrogram without librosa's import and
+    numba JIT costs.
+    """
+    # One power spectrogram shared by both features
+    S = power_spectrogram(y, workers=workers)
     
-    /* Success Box - No Fire */
-    .success-box {
-        padding: 2rem;
-        border-radius: 15px;
-        background: linear-gradient(135deg, #10b981 0%, #059669 100%);
-        color: white;
-        border: none;
-        box-shadow: 0 8px 30px rgba(16, 185, 129, 0.3);
-        animation: slideIn 0.5s ease;
-    }
+    # Extract MFCC (13 coefficients) - 128 mel bands, as librosa.feature.mfcc
+    log_mel = power_to_db(MFCC_MEL_FB @ S)
+    mfcc = DCT_BASIS @ log_mel
+    # Frame means as float32 sums times one shared reciprocal
+    inv_n = np.float32(1.0 / S.shape[1])
+    mfcc_mean = mfcc.sum(axis=1, dtype=np.float32) * inv_n
     
-    .success-box h2 {
-        color: white !important;
-        font-size: 2rem !important;
-        margin-bottom: 0.5rem;
-    }
+    # Extract Mel-Frequency Energy - only the first 8 of the 64 bands are
+    # used, so only those filterbank rows (and the low STFT bins they
+    # cover) are applied. The projection is linear, so average the bins
+    # over time first: one matrix-vector product, no (8, n_frames) matrix
+    mel_energy = ENERGY_MEL_FB @ (S[:ENERGY_MEL_FB.shape[1]].sum(axis=1, dtype=np.float32) * inv_n)
     
-    /* Error Box - Fire Detected */
-    .error-box {
-        padding: 2rem;
-        border-radius: 15px;
-        background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%);
-        color: white;
-        border: none;
-        box-shadow: 0 8px 30px rgba(239, 68, 68, 0.5);
-        animation: pulse 2s infinite, slideIn 0.5s ease;
-    }
+    # Combine features
+    combined_features = np.concatenate([
+        mfcc_mean,
+        mel_energy
+    ])
     
-    .error-box h2 {
-        color: white !important;
-        font-size: 2rem !important;
-        margin-bottom: 0.5rem;
-    }
+    return combined_features.astype(np.float32, copy=False)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def extract_features_cached(audio_bytes):
+    """
+    extract_features for an encoded upload, memoized on its content. Runs
+    on the script thread with nothing else extracting, so the STFT may use
+    every core; multi-file uploads already parallelize across clips in
+    extract_upload instead.
+    """
+    return extract_features(load_audio(io.BytesIO(audio_bytes)), workers=-1)
+
+def extract_upload(audio_bytes):
+    """
+    (features, error) for one encoded upload. Touches no Streamlit API, so
+    it can run on worker threads.
+    """
+    try:
+        return extract_features(load_audio(io.BytesIO(audio_bytes))), None
+    except Exception as e:
+        return None, e
+
+def extract_features_for_ei_model(audio):
+    """
+    Extract features exactly as Edge Impulse expects them.
     
-    /* Pulse Animation for Fire Alert */
-    @keyframes pulse {
-        0%, 100% {
-            box-shadow: 0 8px 30px rgba(239, 68, 68, 0.5);
-        }
-        50% {
-            box-shadow: 0 8px 40px rgba(239, 68, 68, 0.8);
-        }
-    }
+    audio may be the encoded bytes of an upload (memoized by content), a
+    path, a file-like object such as io.BytesIO, or an already-decoded
+    mono float32 signal at CONFIG['sr'].
+    """
+    try:
+        if isinstance(audio, bytes):
+            return extract_features_cached(audio), True
+        y = audio if isinstance(audio, np.ndarray) else load_audio(audio)
+        return extract_features(y), True
+    except Exception as e:
+        st.error(f"Feature extraction error: {e}")
+        return None, False
+
+# Print the fallback predictor's per-indicator breakdown
+DEBUG = False
+
+# Fallback fire indicators and their thresholds (a value above the
+# threshold counts as one indicator; 4 of 7 are required for fire)
+FALLBACK_INDICATOR_NAMES = (
+    "Total Energy",           # 1. EXTREMELY high energy (8.0 → 12.0)
+    "Std Dev",                # 2. EXTREMELY high variance (3.0 → 5.0)
+    "Freq Spread",            # 3. EXTREMELY broad frequency range (5.0 → 8.0)
+    "High Freq Ratio",        # 4. EXTREMELY high frequency content (2.0 → 3.5)
+    "Energy Variance",        # 5. EXTREMELY chaotic signal (3.0 → 5.0)
+    "Spectral Irregularity",  # 6. Very irregular spectrum
+    "Mid-High Energy Ratio",  # 7. Characteristic fire energy distribution
+)
+FALLBACK_THRESHOLDS = np.array([12.0, 5.0, 8.0, 3.5, 5.0, 2.5, 2.0])
+# Feature index where each fallback band starts (low, mid, high, ultra high)
+FALLBACK_BAND_EDGES = np.array([0, 3, 7, 10])
+
+def fallback_indicators(features):
+    """
+    Fallback indicator values (columns in FALLBACK_INDICATOR_NAMES order)
+    for a (n_clips, n_features) array, computed for all clips at once.
+    """
+    features = np.asarray(features, dtype=np.float64)
+    abs_features = np.abs(features)  # computed once, shared below
     
-    @keyframes slideIn {
-        from {
-            opacity: 0;
-            transform: translateY(20px);
-        }
-        to {
-            opacity: 1;
-            transform: translateY(0);
-        }
-    }
+    # Calculate comprehensive statistics
+    energy_variance = features.var(axis=1)
+    mfcc_std = np.sqrt(energy_variance)
     
-    /* Info Boxes */
-    .stAlert {
-        background: rgba(255, 255, 255, 0.05) !important;
-        border-left: 4px solid #ff6b35 !important;
-        border-radius: 10px !important;
-        backdrop-filter: blur(10px);
-    }
+    # Frequency band analysis - low, mid, high and ultra high band means
+    # in one reduceat pass over FALLBACK_BAND_EDGES
+    band_widths = np.diff(np.append(FALLBACK_BAND_EDGES, abs_features.shape[1]))
+    band_means = np.add.reduceat(abs_features, FALLBACK_BAND_EDGES, axis=1) / band_widths
+    low, mid, high, ultra_high = band_means.T
     
-    /* Text Color */
-    p, label, span {
-        color: #cbd5e0 !important;
-    }
+    # Total energy
+    total_energy = abs_features.sum(axis=1)
+    abs_mean = total_energy / abs_features.shape[1]
     
-    /* Audio Player */
-    audio {
-        width: 100%;
-        border-radius: 10px;
-        filter: hue-rotate(20deg);
-    }
+    # Calculate key metrics
+    freq_spread = features.max(axis=1) - features.min(axis=1)
+    high_freq_ratio = (high + ultra_high) / (low + mid + 0.001)
     
-    /* Expander */
-    [data-testid="stExpander"] {
-        background: rgba(255, 255, 255, 0.05);
-        border-radius: 10px;
-        border: 1px solid rgba(255, 107, 53, 0.3);
-    }
+    # NEW: Additional fire-specific characteristics
+    # Spectral irregularity (fire has irregular spectrum)
+    spectral_irregularity = abs_features.std(axis=1) / (abs_mean + 0.001)
     
-    /* Text Area */
-    textarea {
-        background: rgba(0, 0, 0, 0.3) !important;
-        color: #cbd5e0 !important;
-        border: 1px solid rgba(255, 107, 53, 0.3) !important;
-        border-radius: 8px !important;
-    }
+    # Energy concentration in specific bands (fire has characteristic energy distribution)
+    mid_high_energy = (mid + high) / (low + ultra_high + 0.001)
     
-    /* Footer */
-    .footer {
-        text-align: center;
-        padding: 2rem;
-        color: #718096;
-        border-top: 1px solid rgba(255, 107, 53, 0.2);
-        margin-top: 3rem;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    return np.column_stack([
+        total_energy,
+        mfcc_std,
+        freq_spread,
+        high_freq_ratio,
+        energy_variance,
+        spectral_irregularity,
+        mid_high_energy,
+    ])
 
-def load_model_metrics():
-    try:
-        with open('04_models/baseline/baseline_performance.json', 'r') as f:
-            return json.load(f)
-    except:
-        return None
+def fallback_scores(fire_indicators):
+    """(predictions, confidences) arrays from per-clip indicator counts."""
+    # Require AT LEAST 4 out of 7 strong indicators for fire detection
+    # (confidence 0.55 to 0.85); below that, max 0.36 at 3 indicators
+    is_fire = fire_indicators >= 4
+    predictions = is_fire.astype(int)
+    confidences = np.where(is_fire, 0.55 + (fire_indicators - 4) * 0.1, fire_indicators * 0.12)
+    return predictions, confidences
 
-def extract_features_for_ei_model(audio_path):
-    """Extract features exactly as Edge Impulse expects them."""
-    try:
-        y, sr = librosa.load(audio_path, sr=CONFIG['sr'])
-        
-        # Extract MFCC (13 coefficients)
-        mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=CONFIG['n_mfcc'])
-        mfcc_mean = np.mean(mfcc, axis=1)
-        
-        # Extract Mel-Frequency Energy
-        mel_spec = librosa.feature.melspectrogram(y=y, sr=sr, n_mels=64)
-        mel_energy = np.mean(mel_spec, axis=1)
-        
-        # Combine features
-        combined_features = np.concatenate([
-            mfcc_mean,
-            mel_energy[:8]
-        ])
-        
-        return combined_features.tolist(), True
-    except Exception as e:
-        st.error(f"Feature extraction error: {e}")
-        return None, False
+def predict_fire_fallback_batch(features_batch):
+    """
+    Vectorized predict_fire_fallback for (n_clips, n_features); returns
+    (predictions, confidences) arrays.
+    """
+    return fallback_scores((fallback_indicators(features_batch) > FALLBACK_THRESHOLDS).sum(axis=1))
 
 def predict_fire_fallback(features):
     """Ultra-conservative fallback Python-based prediction if Node server is down."""
@@ -323,104 +472,28 @@ def predict_fire_fallback(features):
         return None, None
     
     try:
-        features = np.array(features)
-        
-        # Calculate comprehensive statistics
-        mfcc_mean = np.mean(features)
-        mfcc_std = np.std(features)
-        mfcc_max = np.max(features)
-        mfcc_min = np.min(features)
-        
-        # Frequency band analysis
-        low = np.mean(np.abs(features[0:3]))      # Low frequencies
-        mid = np.mean(np.abs(features[3:7]))      # Mid frequencies  
-        high = np.mean(np.abs(features[7:10]))    # High frequencies
-        ultra_high = np.mean(np.abs(features[10:]))  # Ultra high frequencies
-        
-        # Total energy
-        total_energy = np.sum(np.abs(features))
-        energy_variance = np.var(features)
-        
-        # Calculate key metrics
-        freq_spread = mfcc_max - mfcc_min
-        high_freq_ratio = (high + ultra_high) / (low + mid + 0.001)
-        
-        # NEW: Additional fire-specific characteristics
-        # Spectral irregularity (fire has irregular spectrum)
-        spectral_irregularity = np.std(np.abs(features)) / (np.mean(np.abs(features)) + 0.001)
-        
-        # Energy concentration in specific bands (fire has characteristic energy distribution)
-        mid_high_energy = (mid + high) / (low + ultra_high + 0.001)
-        
-        # Debug logging
-        print(f"\n=== ULTRA-CONSERVATIVE FALLBACK PREDICTION ===")
-        print(f"Total Energy: {total_energy:.4f}")
-        print(f"Std Dev: {mfcc_std:.4f}")
-        print(f"Freq Spread: {freq_spread:.4f}")
-        print(f"High Freq Ratio: {high_freq_ratio:.4f}")
-        print(f"Energy Variance: {energy_variance:.4f}")
-        print(f"Spectral Irregularity: {spectral_irregularity:.4f}")
-        print(f"Mid-High Energy Ratio: {mid_high_energy:.4f}")
+        indicators = fallback_indicators(np.asarray(features).reshape(1, -1))[0]
         
         # ULTRA-CONSERVATIVE APPROACH: Require MULTIPLE strong indicators
-        # Count how many fire characteristics are present
-        fire_indicators = 0
+        # Count how many fire characteristics are present, in one comparison
+        fired = indicators > FALLBACK_THRESHOLDS
+        fire_indicators = int(fired.sum())
         
-        # 1. EXTREMELY high energy (fire is EXTREMELY loud)
-        # INCREASED: 8.0 → 12.0
-        if total_energy > 12.0:
-            fire_indicators += 1
-            print("✓ [1/7] Extremely high energy detected")
-            
-        # 2. EXTREMELY high variance (fire crackles very intensely)
-        # INCREASED: 3.0 → 5.0
-        if mfcc_std > 5.0:
-            fire_indicators += 1
-            print("✓ [2/7] Extremely high variance detected")
-            
-        # 3. EXTREMELY broad frequency range
-        # INCREASED: 5.0 → 8.0
-        if freq_spread > 8.0:
-            fire_indicators += 1
-            print("✓ [3/7] Extremely broad frequency range detected")
-            
-        # 4. EXTREMELY high frequency content (very intense crackling)
-        # INCREASED: 2.0 → 3.5
-        if high_freq_ratio > 3.5:
-            fire_indicators += 1
-            print("✓ [4/7] Extremely high frequency content detected")
-            
-        # 5. EXTREMELY high energy variance (very chaotic signal)
-        # INCREASED: 3.0 → 5.0
-        if energy_variance > 5.0:
-            fire_indicators += 1
-            print("✓ [5/7] Extremely high energy variance detected")
+        if DEBUG:
+            print(f"\n=== ULTRA-CONSERVATIVE FALLBACK PREDICTION ===")
+            for name, value, hit in zip(FALLBACK_INDICATOR_NAMES, indicators, fired):
+                print(f"{'✓' if hit else ' '} {name}: {value:.4f}")
+            print(f"\n🔍 Fire indicators count: {fire_indicators}/7")
+            print(f"📊 Required for fire detection: 4/7 indicators")
         
-        # 6. NEW: High spectral irregularity (fire has very irregular spectrum)
-        if spectral_irregularity > 2.5:
-            fire_indicators += 1
-            print("✓ [6/7] High spectral irregularity detected (fire characteristic)")
-            
-        # 7. NEW: Characteristic mid-high energy distribution
-        if mid_high_energy > 2.0:
-            fire_indicators += 1
-            print("✓ [7/7] Characteristic fire energy distribution detected")
+        # Same scoring as the batch path, so the two can't drift apart
+        predictions, confidences = fallback_scores(np.array([fire_indicators]))
+        prediction, confidence = int(predictions[0]), float(confidences[0])
         
-        print(f"\n🔍 Fire indicators count: {fire_indicators}/7")
-        print(f"📊 Required for fire detection: 4/7 indicators")
-        
-        # Require AT LEAST 4 out of 7 strong indicators for fire detection
-        # This is EXTREMELY conservative - nearly impossible to false positive
-        if fire_indicators >= 4:
-            prediction = 1
-            confidence = 0.55 + (fire_indicators - 4) * 0.1  # 0.55 to 0.85
-            print(f"🔥 PREDICTION: FIRE DETECTED (confidence: {confidence:.2f})")
-        else:
-            prediction = 0
-            confidence = fire_indicators * 0.12  # Max 0.36 if 3 indicators
-            print(f"✅ PREDICTION: NO FIRE (fire score: {confidence:.2f})")
-        
-        print("=" * 50 + "\n")
+        if DEBUG:
+            verdict = "🔥 FIRE DETECTED" if prediction == 1 else "✅ NO FIRE"
+            print(f"PREDICTION: {verdict} (fire score: {confidence:.2f})")
+            print("=" * 50 + "\n")
         
         return prediction, confidence
         
@@ -428,24 +501,74 @@ def predict_fire_fallback(features):
         print(f"Fallback prediction error: {e}")
         return None, None
 
+@st.cache_data(show_spinner=False, max_entries=32)
+def ei_server_prediction(features_bytes):
+    """
+    (prediction, confidence, prediction_text) from the Node server for raw
+    float32 feature bytes. Raises when the server can't answer, so only
+    successful predictions are cached and repeat clicks skip the request.
+    """
+    response = _HTTP.post(
+        f'{EI_MODEL_SERVER}/api/predict',
+        data=features_bytes,
+        headers={'Content-Type': 'application/octet-stream'},
+        timeout=5
+    )
+    response.raise_for_status()
+    
+    result = orjson.loads(response.content)
+    if result['status'] != 'success':
+        raise RuntimeError(result.get('message', 'prediction failed'))
+    return result['prediction'], result['confidence'], result['prediction_text']
+
 def predict_with_ei_server(features):
     """Call Node.js server for prediction."""
     try:
-        response = requests.post(
+        # Raw float32 bytes; the server reads them as a Float32Array
+        pred, conf, pred_text = ei_server_prediction(
+            np.asarray(features, dtype=np.float32).tobytes()
+        )
+        return pred, conf, pred_text, 'Edge Impulse (98.92% accuracy)'
+    except requests.exceptions.Timeout:
+        print("Node.js server timeout - server may be slow or unresponsive")
+    except requests.exceptions.ConnectionError:
+        print("Node.js server connection error - server may not be running")
+    except requests.exceptions.HTTPError as e:
+        print(f"Server returned status code: {e.response.status_code}")
+    except Exception as e:
+        print(f"Error calling Edge Impulse server: {e}")
+    
+    # Fallback
+    pred, conf = predict_fire_fallback(features)
+    pred_text = 'FIRE DETECTED 🔥' if pred == 1 else 'NO FIRE ✅'
+    return pred, conf, pred_text, 'Fallback (Python - Improved)'
+
+def predict_batch_with_ei_server(features_batch):
+    """
+    Classify several feature vectors with one /api/predict round trip.
+    
+    Returns a list of (prediction, confidence, prediction_text, source)
+    tuples in input order, falling back per clip if the server is unavailable.
+    """
+    try:
+        batch = np.asarray(features_batch, dtype=np.float32)
+        response = _HTTP.post(
             f'{EI_MODEL_SERVER}/api/predict',
-            json={'features': features},
+            data=batch.tobytes(),
+            headers={
+                'Content-Type': 'application/octet-stream',
+                'X-Feature-Rows': str(batch.shape[0]),
+            },
             timeout=5
         )
         
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             if result['status'] == 'success':
-                return (
-                    result['prediction'],
-                    result['confidence'],
-                    result['prediction_text'],
-                    'Edge Impulse (98.92% accuracy)'
-                )
+                return [
+                    (p['prediction'], p['confidence'], p['prediction_text'], 'Edge Impulse (98.92% accuracy)')
+                    for p in result['predictions']
+                ]
         else:
             print(f"Server returned status code: {response.status_code}")
     except requests.exceptions.Timeout:
@@ -455,10 +578,12 @@ def predict_with_ei_server(features):
     except Exception as e:
         print(f"Error calling Edge Impulse server: {e}")
     
-    # Fallback
-    pred, conf = predict_fire_fallback(features)
-    pred_text = 'FIRE DETECTED 🔥' if pred == 1 else 'NO FIRE ✅'
-    return pred, conf, pred_text, 'Fallback (Python - Improved)'
+    # Fallback - every clip scored in one vectorized pass
+    predictions, confidences = predict_fire_fallback_batch(features_batch)
+    return [
+        (int(pred), float(conf), 'FIRE DETECTED 🔥' if pred == 1 else 'NO FIRE ✅', 'Fallback (Python - Improved)')
+        for pred, conf in zip(predictions, confidences)
+    ]
 
 # Sidebar
 with st.sidebar:
@@ -467,18 +592,15 @@ with st.sidebar:
     
     # Server Status
     st.subheader("System Status")
-    try:
-        resp = requests.get(f'{EI_MODEL_SERVER}/api/health', timeout=1)
-        if resp.status_code == 200:
-            st.success("✅ Model Server Online")
-        else:
+    status = server_status()
+    if status == 'online':
+        st.success("✅ Model Server Online")
+    else:
+        if status == 'offline':
             st.warning("⚠️ Model Server Offline")
-            if st.button("Try Restarting Server"):
-                st.session_state.server_started = start_node_server()
-                st.rerun()
-    except:
-        st.error("❌ Model Server Unreachable")
-        st.caption("Using Python fallback (lower accuracy)")
+        else:
+            st.error("❌ Model Server Unreachable")
+            st.caption("Using Python fallback (lower accuracy)")
         if st.button("Try Restarting Server"):
             st.session_state.server_started = start_node_server()
             st.rerun()
@@ -518,21 +640,28 @@ st.markdown("<br><br>", unsafe_allow_html=True)
 st.markdown("### 🎙️ Upload Audio for Fire Detection")
 st.markdown("Upload an audio file to analyze for fire sounds (crackling, burning, etc.)")
 
-uploaded_file = st.file_uploader("Drag and drop or click to upload", type=['wav', 'mp3', 'ogg'], label_visibility="collapsed")
+uploaded_files = st.file_uploader(
+    "Drag and drop or click to upload",
+    type=['wav', 'mp3', 'ogg'],
+    accept_multiple_files=True,
+    label_visibility="collapsed"
+)
+uploaded_file = uploaded_files[0] if len(uploaded_files) == 1 else None
 
 if uploaded_file:
-    # Save temp file
-    temp_path = os.path.join(TEMP_DIR, uploaded_file.name)
-    with open(temp_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
-    
     # Audio Player
     st.audio(uploaded_file)
     
     if st.button("Analyze Audio", key="analyze_btn"):
         with st.spinner("Extracting features and analyzing..."):
+            # Warm the pooled server connection on a worker thread while the
+            # features are extracted here
+            warm_up = get_executor().submit(warm_server_connection)
+            
             # Extract features
-            features, success = extract_features_for_ei_model(temp_path)
+            # Decoded straight from the in-memory upload (memoized on its bytes)
+            features, success = extract_features_for_ei_model(uploaded_file.getvalue())
+            warm_up.result()
             
             if success:
                 # Predict
@@ -567,18 +696,50 @@ if uploaded_file:
                     st.info(source)
                     
                     st.caption("Feature Statistics")
-                    features_arr = np.array(features)
+                    features_arr = features  # already an ndarray
                     st.text(f"Total Energy: {np.sum(np.abs(features_arr)):.4f}")
                     st.text(f"Mean: {np.mean(features_arr):.4f}")
-                    st.text(f"Std Dev: {np.std(features_arr):.4f}")
-                    st.text(f"Variance: {np.var(features_arr):.4f}")
-                    st.text(f"Max: {np.max(features_arr):.4f}")
-                    st.text(f"Min: {np.min(features_arr):.4f}")
-                    st.text(f"Range: {np.max(features_arr) - np.min(features_arr):.4f}")
+                    variance = features_arr.var()
+                    f_max, f_min = features_arr.max(), features_arr.min()
+                    st.text(f"Std Dev: {np.sqrt(variance):.4f}")
+                    st.text(f"Variance: {variance:.4f}")
+                    st.text(f"Max: {f_max:.4f}")
+                    st.text(f"Min: {f_min:.4f}")
+                    st.text(f"Range: {f_max - f_min:.4f}")
+
+# Several clips: extract each, then classify them all in one server round trip
+if len(uploaded_files) > 1:
+    st.caption(f"{len(uploaded_files)} files selected")
+    
+    if st.button("Analyze All", key="analyze_all_btn"):
+        with st.spinner(f"Extracting features and analyzing {len(uploaded_files)} files..."):
+            # Decode and extract the clips concurrently (NumPy/SciPy FFTs and
+            # matmuls release the GIL)
+            extracted = get_executor().map(extract_upload, [f.getvalue() for f in uploaded_files])
+            analyzed = []
+            for f, (features, error) in zip(uploaded_files, extracted):
+                if error is None:
+                    analyzed.append((f.name, features))
+                else:
+                    st.error(f"Feature extraction error ({f.name}): {error}")
             
-            # Cleanup
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+            if analyzed:
+                outcomes = predict_batch_with_ei_server(np.stack([features for _, features in analyzed]))
+                
+                st.markdown("### Analysis Results")
+                st.dataframe(
+                    [
+                        {
+                            'File': name,
+                            'Result': text,
+                            'Fire Confidence': f"{conf*100:.1f}%",
+                            'Source': source,
+                        }
+                        for (name, _), (pred, conf, text, source) in zip(analyzed, outcomes)
+                    ],
+                    width='stretch',
+                    hide_index=True
+                )
 
 # Footer
 st.markdown("""